@@ -40,11 +40,13 @@ Options:
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
+import functools
 import os
 import re
 import sys
-import io
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import colorlog
@@ -66,9 +68,42 @@ COOLDOWN_SECONDS = 60
 LOGGING_STREAM = sys.stderr
 DEBUG = bool(os.getenv("DEBUG", "").lower() in ("1", "true", "yes"))
 
+# the platform never changes at runtime, evaluate once at import time
+IS_WINDOWS = sys.platform == "win32"
+
 # RegEx to find the archive password between curly brackets
 PASSWORD_REGEX = r"\{\{([^}]+)\}\}"
 
+# precompiled patterns (compiling once avoids re-cache lookups in the hot loops)
+_RE_PWD = re.compile(PASSWORD_REGEX)
+# suffix fast-path for the classification: ".rar"/".7z" singles, "1" catches
+# multi-volume 7z primers (.7z.001, .7z.1, ...); one C-level endswith call;
+# interned explicitly so comparisons in the hot loops take the pointer path
+_ARCHIVE_SUFFIXES = tuple(sys.intern(s) for s in (".rar", ".7z", "1"))
+_SUFFIX_RAR = sys.intern(".rar")
+_SUFFIX_7Z = sys.intern(".7z")
+
+# extraction command templates, formatted once per archive
+#   7z:     x = extract with paths, -aos = skip extracting of existing files
+#   unrar:  x = extract with paths, -o-  = do not overwrite
+_CMD_7Z = '7z x -aos -o"{targetdir}/" "{filepath}"'
+_CMD_7Z_PWD = '7z x -aos -o"{targetdir}/" -p"{pwd}" "{filepath}"'
+_CMD_UNRAR = 'unrar x -o- "{filepath}" "{targetdir}/"'
+_CMD_UNRAR_PWD = 'unrar x -o- -p"{pwd}" "{filepath}" "{targetdir}/"'
+
+# applied to lower-cased names only; skipping re.IGNORECASE spares the
+# engine's per-character case folding
+_RE_RAR_PRIMER = re.compile(r"\.part0*1\.rar$")
+_RE_RAR_PART = re.compile(r"\.part[0-9]+\.rar$")
+_RE_7Z = re.compile(r"\.7z(\.0*1)?$")
+# fused alternation: one pass over the filename tail decides the archive
+# kind via the name of the matching group
+_RE_CLASSIFY = re.compile(
+    r"(?P<part>\.part[0-9]+\.rar)$|"
+    r"(?P<single>\.rar)$|"
+    r"(?P<z1>\.7z\.0*1)$|"
+    r"(?P<z>\.7z)$")
+
 # check for Python3
 if sys.version_info < (3, 0):
     sys.stderr.write("Minimum required version is Python 3.x!\n")
@@ -98,16 +133,28 @@ def __setup_logging(log_file: str = None, verbose=False, no_color=False):
 
 
 class Archiver:
-    """Base class for archives handling (e.g., RAR, 7zip)."""
+    """Base class for archives handling (e.g., RAR, 7zip).
 
-    def __init__(self):
-        """Handle archiving."""
-        self.rm_command = "del /q" if _is_ms_windows() else "rm -fv"
+    The archivers are stateless namespaces of static methods; the
+    module-level singletons below can be shared freely.
+    """
 
-    def build_rm_command(self, filepath: Path) -> str:
-        """Construct remove commands."""
+    @staticmethod
+    def rm_command() -> str:
+        """Return the platform-specific remove command."""
+        return "del /q" if _is_ms_windows() else "rm -fv"
+
+    @staticmethod
+    def build_rm_command(filepath: Path, sibling_names: set[str] = None) -> str:
+        """Construct remove commands.
+
+        :param filepath: path of the archive file
+        :param sibling_names: lower-cased filenames in the archive's directory,
+                              scanned lazily if not provided
+        """
 
-    def find_archive_files(self, files: list[str]) -> set[str]:
+    @staticmethod
+    def find_archive_files(files: list[str]) -> set[str]:
         """Find the filenames of single or multi-volume archives.
 
         :param files: list of filenames
@@ -121,57 +168,75 @@ class ArchiverRar(Archiver):
     @staticmethod
     def is_volume_primer(filename: str) -> bool:
         """Check if the filename is the first part of a multi-volume RAR archive."""
-        return re.search(r"\.part0*1\.rar$", filename, re.IGNORECASE) is not None
+        return _RE_RAR_PRIMER.search(filename.lower()) is not None
 
     @staticmethod
     def is_volume_part(filename: str) -> bool:
         """Check if the filename is part of a v5 multi-volume RAR archive."""
-        return re.search(r"\.part[0-9]+\.rar$", filename, re.IGNORECASE) is not None
+        return _RE_RAR_PART.search(filename.lower()) is not None
 
     @staticmethod
     def get_basename(filename: str) -> str:
         """Return the archive's basename, i.e., without multi-volume parts."""
+        # plain string operations, considerably cheaper than a regex here
+        low = filename.lower()
+        if not low.endswith(_SUFFIX_RAR):
+            return filename
         # strip partX, e.g., "xyz.part1.rar" --> "xyz"
-        return re.sub(r"(\.part\d+)?\.rar$", "", filename, count=1, flags=re.IGNORECASE)
+        low_stem = low[:-4]
+        i = low_stem.rfind(".part")
+        if i >= 0 and low_stem[i + 5:].isdigit():
+            return filename[:i]
+        return filename[:-4]
 
-    def build_rm_command(self, filepath: Path) -> str:
+    @staticmethod
+    def build_rm_command(filepath: Path, sibling_names: set[str] = None) -> str:
         """Construct remove commands."""
-        assert filepath.suffix == ".rar"
+        rm_command = Archiver.rm_command()
+        # accept Path or str at the boundary, then work on the raw string only
+        path_str = str(filepath)
+        assert path_str.endswith(".rar")
+        dirpart, name = os.path.split(path_str)
+        # paths coming from main() are already absolute; for relative input
+        # resolve the parent once via the memoized helper
+        if os.path.isabs(path_str):
+            fp = path_str
+        else:
+            fp = f"{_resolve(dirpart or '.')}{os.sep}{name}"
 
         # "xyz.rar" -> ["xyz.rar", "xyz.r*", "xyz.par2"]
-        if not ArchiverRar.is_volume_part(filepath.name):
-            if Path(filepath.with_suffix(".r00")).exists():
+        if not ArchiverRar.is_volume_part(name):
+            if sibling_names is None:
+                # no directory listing provided, scan once (O(1) stat instead per file)
+                sibling_names = {entry.name.lower() for entry in os.scandir(os.path.dirname(fp))}
+            # strip the ".rar" suffix once and format all siblings from it
+            stem = fp[:-4]
+            if f"{name[:-4]}.r00".lower() in sibling_names:
                 # 'rm "/absolute/xyz.rar" "/absolute/xyz.r*" "/absolute/xyz.par2'
-                return (f'{self.rm_command} "{filepath.resolve()}" '
-                        f'"{filepath.with_suffix("").resolve()}".r* '
-                        f'"{filepath.with_suffix("").resolve()}.par2"')
+                return f'{rm_command} "{fp}" "{stem}".r* "{stem}.par2"'
             # else
-            return f'{self.rm_command} "{filepath.resolve()}" "{filepath.with_suffix(".par2").resolve()}"'
+            return f'{rm_command} "{fp}" "{stem}.par2"'
 
         # strip partX, e.g., "xyz.part1.rar" --> "xyz"
         # "xyz.partNNN.rar" -> "xyz.part*.rar"
-        basename = ArchiverRar.get_basename(filepath.name)
-        basefilepath = filepath.with_name(f"{basename}").resolve()
-        return f'{self.rm_command} "{basefilepath}".part*.rar "{basefilepath}.par2"'
+        base = f"{fp[:-len(name)]}{ArchiverRar.get_basename(name)}"
+        return f'{rm_command} "{base}".part*.rar "{base}.par2"'
 
-    def find_archive_files(self, files: list[str]) -> set[str]:
+    @staticmethod
+    def find_archive_files(files: list[str]) -> set[str]:
         """Find the filenames of single or multi-volume archives.
 
         :param files: list of filenames
         :return set of only the 1st filename of multi-volume archives
         """
         result = set()
-
-        # single files, no multi-volume
         for filename in files:
-            if filename.lower().endswith(".rar") and not self.is_volume_part(filename):
+            low = filename.lower()
+            if not low.endswith(_SUFFIX_RAR):
+                continue
+            # single archives, or the 1st volume of a multi-volume archive
+            if not _RE_RAR_PART.search(low) or _RE_RAR_PRIMER.search(low):
                 result.add(filename)
-
-        # multi-volumes
-        for filename in files:
-            if self.is_volume_primer(filename):
-                result.add(filename)
-
         return result
 
 
@@ -181,22 +246,41 @@ class Archiver7z(Archiver):
     @staticmethod
     def is_7zip(filename: str) -> bool:
         """Check if the filename is a 7zip single or 7zip multi-volume."""
-        return re.search(r"\.7z(\.0*1)?$", filename, re.IGNORECASE) is not None
+        return _RE_7Z.search(filename.lower()) is not None
 
     @staticmethod
     def get_basename(filename: str) -> str:
         """Return the archive's basename, i.e., without multi-volume parts."""
+        # plain string operations, considerably cheaper than a regex here
+        low = filename.lower()
+        if low.endswith(_SUFFIX_7Z):
+            # e.g., "xyz.7z" -> "xyz"
+            return filename[:-3]
         # e.g., "xyz.7z.001" -> "xyz"
-        return re.sub(r"\.7z(\.[0-9]+)?$", "", filename, count=1, flags=re.IGNORECASE)
+        i = low.rfind(".7z.")
+        if i >= 0 and low[i + 4:].isdigit():
+            return filename[:i]
+        return filename
 
-    def build_rm_command(self, filepath: Path) -> str:
+    @staticmethod
+    def build_rm_command(filepath: Path, sibling_names: set[str] = None) -> str:
         """Construct remove commands."""
-        assert filepath.suffix in (".7z", ".001")
-        basename = Archiver7z.get_basename(filepath.name)
-        basefilepath = filepath.with_name(f"{basename}").resolve()
-        return f'{self.rm_command} "{basefilepath}".7z* "{basefilepath}.par2"'
+        rm_command = Archiver.rm_command()
+        # accept Path or str at the boundary, then work on the raw string only
+        path_str = str(filepath)
+        assert path_str.endswith((".7z", ".001"))
+        dirpart, name = os.path.split(path_str)
+        # paths coming from main() are already absolute; for relative input
+        # resolve the parent once via the memoized helper
+        if os.path.isabs(path_str):
+            fp = path_str
+        else:
+            fp = f"{_resolve(dirpart or '.')}{os.sep}{name}"
+        base = f"{fp[:-len(name)]}{Archiver7z.get_basename(name)}"
+        return f'{rm_command} "{base}".7z* "{base}.par2"'
 
-    def find_archive_files(self, files: list[str]) -> set[str]:
+    @staticmethod
+    def find_archive_files(files: list[str]) -> set[str]:
         """Find the filenames of single or multi-volume archives.
 
         :param files: list of filenames
@@ -204,18 +288,210 @@ class Archiver7z(Archiver):
         """
         result = set()
         for filename in files:
-            if self.is_7zip(filename):
+            if Archiver7z.is_7zip(filename):
                 result.add(filename)
         return result
 
 
+def classify_files(files: list[str]) -> tuple[set[str], set[str]]:
+    """Classify filenames as RAR or 7zip archives in a single pass.
+
+    Cheap suffix checks act as fast-path before the regexes run, so
+    non-archive filenames are rejected without regex work.
+
+    :param files: list of filenames
+    :return: tuple (rar_names, sevenz_names), each containing only the
+             1st filename of multi-volume archives
+    """
+    rar_names = set()
+    sevenz_names = set()
+    # bind the compiled matchers to locals, skipping the module-global and
+    # attribute lookups in the per-filename loop
+    classify_search = _RE_CLASSIFY.search
+    primer_search = _RE_RAR_PRIMER.search
+    for filename in files:
+        low = filename.lower()
+        if not low.endswith(_ARCHIVE_SUFFIXES):
+            continue
+        match = classify_search(low)
+        if not match:
+            continue
+        kind = match.lastgroup
+        if kind == "part":
+            # only the 1st volume of a multi-volume archive is relevant
+            if primer_search(low):
+                rar_names.add(filename)
+        elif kind == "single":
+            rar_names.add(filename)
+        else:
+            # "z1" or "z"
+            sevenz_names.add(filename)
+    return rar_names, sevenz_names
+
+
+# stateless module-level singletons, shared by main() and the workers
+RAR_ARCHIVER = ArchiverRar()
+SEVENZ_ARCHIVER = Archiver7z()
+
+
+def _scan(rootdir: Path):
+    """Walk rootdir recursively using os.scandir, avoiding extra stat syscalls.
+
+    The yielded os.DirEntry objects carry cached stat results, so callers
+    can read file sizes without an additional os.stat per file.
+    Directories are visited in sorted order for deterministic output.
+    Hidden directories (".foo", "__MACOSX") are pruned, and symlinks are
+    never followed, so symlink loops cannot occur. Directories without
+    any archive-like file are filtered out while their entries are
+    scanned, so callers never see them.
+
+    :param rootdir: starting root directory
+    :return: generator of (dirpath, filenames, entries_by_name) tuples
+    """
+    stack = [str(rootdir)]
+    while stack:
+        dirpath = stack.pop()
+        subdirs = []
+        entries_by_name = {}
+        has_archive = False
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.startswith(".") or entry.name == "__MACOSX":
+                            # dot-dirs (.git, ...) and macOS cruft never hold NZB archives
+                            continue
+                        subdirs.append(entry.path)
+                    else:
+                        entries_by_name[entry.name] = entry
+                        if not has_archive and entry.name.lower().endswith(_ARCHIVE_SUFFIXES):
+                            has_archive = True
+        except OSError as ex:
+            # skip unreadable or vanished directories and keep scanning,
+            # matching the default os.walk onerror=None semantics
+            logging.warning("cannot scan '%s': %s", dirpath, ex)
+            continue
+        # LIFO stack, so push reverse-sorted to pop in sorted order
+        stack.extend(sorted(subdirs, reverse=True))
+        if has_archive:
+            yield dirpath, list(entries_by_name), entries_by_name
+
+
 def _is_ms_windows() -> bool:
-    return sys.platform == "win32"
+    return IS_WINDOWS
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve(path: str) -> Path:
+    """Resolve a directory path, memoized.
+
+    Many archives share their parent directory, so only distinct
+    directories pay the realpath syscall walk.
+    """
+    return Path(path).resolve()
+
+
+@functools.lru_cache(maxsize=1024)
+def _password_for_dir(path: str) -> str | None:
+    """Extract the {{password}} from a path string, memoized.
+
+    Directories below a common {{password}} ancestor would otherwise
+    re-run the same regex on the same string over and over.
+    """
+    match = _RE_PWD.search(path)
+    return match.group(1) if match else None
 
 
 def _construct_quoted(remove_parts: set[str]) -> set[str]:
-    # convert to strings, quoted
-    return {f'"{str(part)}"' for part in remove_parts}
+    # convert to strings, quoted; the format method is bound only once
+    return set(map('"{}"'.format, remove_parts))
+
+
+def _process_dir(root: str, files: list[str], entries_by_name: dict,
+                 sleep_cmd: str, is_windows: bool) -> list[str]:
+    """Build the unpack commands for one directory.
+
+    :param root: directory path
+    :param files: filenames in the directory
+    :param entries_by_name: os.DirEntry objects by filename
+    :param sleep_cmd: platform sleep command for the cooldown
+    :param is_windows: platform flag, resolved once by the caller
+    :return: list of shell command strings
+    """
+    # find relevant files
+    rar_names, sevenz_names = classify_files(files)
+    archives = rar_names | sevenz_names
+    logging.info("%s, archives: %s", root, ", ".join(archives))
+    if not archives:
+        # no archive files in this folder...
+        return []
+
+    # check for password in folder-name, constant for the whole directory
+    root_pwd = _password_for_dir(root)
+
+    # target directory := archive's directory, absolute (memoized)
+    targetdir = _resolve(root)
+
+    # lower-cased directory listing for O(1) sibling lookups
+    sibling_names = {f.lower() for f in files}
+
+    # bind the template format methods to locals for the loop below
+    fmt_7z = _CMD_7Z.format
+    fmt_7z_pwd = _CMD_7Z_PWD.format
+    fmt_unrar = _CMD_UNRAR.format
+    fmt_unrar_pwd = _CMD_UNRAR_PWD.format
+
+    commands = []
+    for filename in sorted(archives):
+        # password in folder-name wins, otherwise look in the filename
+        pwd = root_pwd or _password_for_dir(filename)
+
+        logging.debug("pwd: %s", pwd)
+
+        # full file path input + output directory (targetdir is already resolved)
+        filepath = targetdir / filename
+
+        # get file size from the cached DirEntry stat result
+        filesize_mb = entries_by_name[filename].stat(follow_symlinks=False).st_size / 1024.0 / 1024.0
+        logging.debug("filesize_mb: %.2f", filesize_mb)
+
+        # classify_files already decided the type, a set lookup suffices here
+        is_7z = filename in sevenz_names
+
+        if is_windows or is_7z:
+            # use 7z for 7zip or if on MS Windows (I do not have unrar on my MS Windows)
+            if pwd:
+                cmd = fmt_7z_pwd(targetdir=targetdir, pwd=pwd, filepath=filepath)
+            else:
+                cmd = fmt_7z(targetdir=targetdir, filepath=filepath)
+        else:
+            # rar file, Linux
+            if pwd:
+                cmd = fmt_unrar_pwd(pwd=pwd, filepath=filepath, targetdir=targetdir)
+            else:
+                cmd = fmt_unrar(filepath=filepath, targetdir=targetdir)
+
+        # remove commands
+        # RAR
+        #   posix:  rm "./some dir/xyz.rar" "./some dir/xyz.r"*
+        #   win32:  del /q ".\some dir\xyz.rar" ".\some dir\xyz.r*"
+        # 7z
+        #   posix:  rm "./some dir/xyz.7z"*
+        #   win32:  del /q ".\some dir\xyz.7z*"
+        #
+        if is_7z:
+            cmd += f' && {SEVENZ_ARCHIVER.build_rm_command(filepath)}'
+        else:
+            # rar
+            cmd += f' && {RAR_ARCHIVER.build_rm_command(filepath, sibling_names)}'
+
+        # if file has a relevant size then add some sleep time for cooldown
+        if filesize_mb > COOLDOWN_THRESHOLD_MB:
+            cmd += f" ; {sleep_cmd} {COOLDOWN_SECONDS}"
+
+        commands.append(cmd)
+
+    return commands
 
 
 def main():
@@ -233,10 +509,9 @@ def main():
     __setup_logging(arg_logfile, arg_verbose, arg_nocolor)
     logging.info(version_string)
 
-    arar = ArchiverRar()
-    a7z = Archiver7z()
-
-    if _is_ms_windows():
+    # resolve the platform exactly once, everything below reads the local
+    is_windows = _is_ms_windows()
+    if is_windows:
         sleep_cmd = "timeout"
         comment = "REM "
     else:
@@ -246,114 +521,56 @@ def main():
     rootdir = Path(arg_root)
     logging.info("root dir: %s", rootdir.resolve())
 
-    commands = []
-
-    # recursive files scanning
-    for root, _, files in os.walk(rootdir):
-
-        # find relevant files
-        archives = set()
-        archives.update(arar.find_archive_files(files))
-        archives.update(a7z.find_archive_files(files))
-        logging.info("%s, archives: %s", root, ", ".join(archives))
-        if not archives:
-            # no archive files in this folder...
-            continue
-
-        # check for password in filename or folder-name
-        pwd = None
-        for filename in archives:
-            # check if password is in filename or in folder-name
-            match = re.search(PASSWORD_REGEX, root)
-            if match:
-                # password is in folder-name
-                pwd = match.group(1)
-            else:
-                # look in filename
-                match = re.search(PASSWORD_REGEX, filename)
-                if match:
-                    # password is in filename
-                    pwd = match.group(1)
-
-            logging.debug("pwd: %s", pwd)
-
-            # full file path input + output directory
-            filepath = Path(root, filename).resolve()
-            # target directory := archive's directory, absolute
-            targetdir = Path(root).resolve()
-
-            # get file size
-            filesize_mb = os.stat(filepath).st_size / 1024.0 / 1024.0
-            logging.debug("filesize_mb: %.2f", filesize_mb)
-
-            if a7z.is_7zip(filename) or _is_ms_windows():
-                # use 7z for 7zip or if on MS Windows (I do not have unrar on my MS Windows)
-                #   x       extract with paths
-                #   -aos 	Skip extracting of existing files.
-                if pwd:
-                    cmd = f'7z x -aos -o"{targetdir}/" -p"{pwd}" "{filepath}"'
-                else:
-                    cmd = f'7z x -aos -o"{targetdir}/" "{filepath}"'
-            else:
-                # rar file, Linux
-                #   x       extract with paths
-                #   -o-     do not overwrite
-                if pwd:
-                    cmd = f'unrar x -o- -p"{pwd}" "{filepath}" "{targetdir}/"'
-                else:
-                    cmd = f'unrar x -o- "{filepath}" "{targetdir}/"'
-
-            # remove commands
-            # RAR
-            #   posix:  rm "./some dir/xyz.rar" "./some dir/xyz.r"*
-            #   win32:  del /q ".\some dir\xyz.rar" ".\some dir\xyz.r*"
-            # 7z
-            #   posix:  rm "./some dir/xyz.7z"*
-            #   win32:  del /q ".\some dir\xyz.7z*"
-            #
-            if a7z.is_7zip(filename):
-                cmd += f' && {a7z.build_rm_command(filepath)}'
-            else:
-                # rar
-                cmd += f' && {arar.build_rm_command(filepath)}'
-
-            # if file has a relevant size then add some sleep time for cooldown
-            if filesize_mb > COOLDOWN_THRESHOLD_MB:
-                cmd += f" ; {sleep_cmd} {COOLDOWN_SECONDS}"
-
-            # print
-            commands.append(cmd)
-
-    logging.debug("#commands: %d", len(commands))
-
-    if not commands:
+    num_commands = 0
+    chcp_emitted = False
+
+    def write_batch(batch):
+        """Write one directory's command batch to STDOUT."""
+        nonlocal num_commands, chcp_emitted
+        if not batch:
+            return
+        lines = []
+        if num_commands == 0:
+            # header is written lazily, so an empty run emits nothing
+            lines.append(f"{comment}created by {version_string} at {datetime.now().isoformat()}")
+        if is_windows and not chcp_emitted and any(not cmd.isascii() for cmd in batch):
+            # switch MS Windows console codepage (e.g. Latin1/Latin15)
+            # before the first non-ASCII command
+            lines.append("chcp 1252")
+            lines.append(f"{comment}{'-' * 50}")
+            chcp_emitted = True
+        for cmd in batch:
+            num_commands += 1
+            lines.append(f"{comment}-- {num_commands}. {'-' * 50}")
+            lines.append(cmd)
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
+
+    # recursive files scanning; the per-directory work is I/O-bound
+    # (scandir, stat, realpath), so threads overlap the syscall latency
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # _scan only yields directories containing archive-like files, so
+        # every submitted task has actual work to do; submit lazily and write
+        # the oldest batch before queueing more, so at most ~2*max_workers
+        # directories are in flight at once instead of the whole tree, while
+        # consuming in submission order keeps the output deterministic
+        pending = deque()
+        for root, files, entries_by_name in _scan(rootdir):
+            pending.append(executor.submit(_process_dir, root, files, entries_by_name, sleep_cmd, is_windows))
+            if len(pending) >= max_workers * 2:
+                write_batch(pending.popleft().result())
+        while pending:
+            write_batch(pending.popleft().result())
+
+    logging.debug("#commands: %d", num_commands)
+
+    if not num_commands:
         return 2
 
-    output = io.StringIO()
-    output.write(
-        f"{comment}created by {version_string} at {datetime.now().isoformat()}")
-    output.write(os.linesep)
-    output.write(f"{comment}{len(commands)} entries")
-    output.write(os.linesep)
-
-    # check if any command has non-ASCII characters, e.g. Latin1/Latin15
-    if _is_ms_windows():
-        has_non_ascii = any([str.isascii(cmd) for cmd in commands])
-        logging.debug("has_non_ascii: %s", has_non_ascii)
-        if has_non_ascii:
-            # switch MS Windows console codepage
-            output.write("chcp 1252")
-            output.write(os.linesep)
-            output.write(f"{comment}{'-' * 50}")
-            output.write(os.linesep)
-
-    for i, cmd in enumerate(commands):
-        output.write(f"{comment}-- {i+1}. {'-' * 50}")
-        output.write(os.linesep)
-        output.write(cmd)
-        output.write(os.linesep)
-
-    print(output.getvalue())
+    # trailer; the total is only known after all directories are streamed
+    sys.stdout.write(f"{comment}{num_commands} entries\n")
+    sys.stdout.flush()
 
     return 0
 
@@ -11,7 +11,7 @@ from nzbdownloadsmultiunpack.multiunpackrecursive import \
     ArchiverRar, Archiver7z, _construct_quoted, main, \
     __version__, __updated__
 
-FILENAMES = [
+FILENAMES = (
     "volume1.part1.rar",
     "volume1.part2.rar",
     "volume1.part3.rar",
@@ -46,81 +46,112 @@ FILENAMES = [
 
     # 7z single
     "volume8.7z",
-]
+)
+
+EXPECTED_RAR = frozenset({"volume1.part1.rar", "volume2.single.rar", "volume3.part1.rar",
+                          "volume4.part001.rar", "volume5.rar", "volume6.part00001.rar"})
+EXPECTED_7Z = frozenset({"volume7.7z.001", "volume8.7z"})
+
+# expected command fragments for the main() tests, built once at module scope
+EXPECTED_7Z_PREFIX = '7z x -aos -o"/'
+EXPECTED_UNRAR_PREFIX = 'unrar x -o- -p"foobardir" "/'
+EXPECTED_7Z_WILDCARD = 'testdata/7z_example.dir.{{foobardir}}/rand.indir".7z*'
+EXPECTED_7Z_PAR2 = 'testdata/7z_example.dir.{{foobardir}}/rand.indir.par2"'
+EXPECTED_RAR_WILDCARD = 'testdata/rar_example.dir.{{foobardir}}/rand.indir".part*.rar'
+EXPECTED_RAR_PAR2 = 'testdata/rar_example.dir.{{foobardir}}/rand.indir.par2"'
+
+
+@pytest.fixture(scope="module", name="resolved")
+def fixture_resolved():
+    """Pre-resolved paths, computed once instead of per assertion."""
+    return {name: Path(name).resolve()
+            for name in ("xyz", "xyz.rar", "xyz.part1.rar", "xyz.par2",
+                         "xyz.7z", "xyz.7z.001")}
+
+
+@pytest.fixture(scope="module", name="archiver_rar")
+def fixture_archiver_rar():
+    return ArchiverRar()
+
+
+@pytest.fixture(scope="module", name="archiver_7z")
+def fixture_archiver_7z():
+    return Archiver7z()
 
 
 class TestArchiverRar:
 
     @staticmethod
-    def test_find_archive_files():
-        actual = ArchiverRar().find_archive_files(FILENAMES)
-        assert actual == {"volume1.part1.rar", "volume2.single.rar", "volume3.part1.rar",
-                          "volume4.part001.rar", "volume5.rar", "volume6.part00001.rar"}
+    def test_find_archive_files(archiver_rar):
+        actual = archiver_rar.find_archive_files(FILENAMES)
+        assert actual == EXPECTED_RAR
 
     @staticmethod
-    def test_get_basename():
-        instance = ArchiverRar()
-        assert instance.get_basename("xyz") == "xyz"
-        assert instance.get_basename("xyz.rar") == "xyz"
-        assert instance.get_basename("xyz.part1.rar") == "xyz"
-        assert instance.get_basename("xyz.part001.rar") == "xyz"
-        assert instance.get_basename("xyz.part000.rar") == "xyz"
+    @pytest.mark.parametrize("filename,expected", [
+        ("xyz", "xyz"),
+        ("xyz.rar", "xyz"),
+        ("xyz.part1.rar", "xyz"),
+        ("xyz.part001.rar", "xyz"),
+        ("xyz.part000.rar", "xyz"),
+    ])
+    def test_get_basename(filename, expected, archiver_rar):
+        assert archiver_rar.get_basename(filename) == expected
 
     @staticmethod
-    def test_build_rm_command():
-        instance = ArchiverRar()
+    def test_build_rm_command(archiver_rar, resolved):
         # input is relative path
-        assert instance.build_rm_command(Path("xyz.rar")) == \
-            f'rm -fv "{Path("xyz.rar").resolve()}" "{Path("xyz.par2").resolve()}"'
-        assert instance.build_rm_command(Path("xyz.part1.rar")) == \
-            f'rm -fv "{Path("xyz").resolve()}".part*.rar "{Path("xyz.par2").resolve()}"'
+        assert archiver_rar.build_rm_command(Path("xyz.rar")) == \
+            f'rm -fv "{resolved["xyz.rar"]}" "{resolved["xyz.par2"]}"'
+        assert archiver_rar.build_rm_command(Path("xyz.part1.rar")) == \
+            f'rm -fv "{resolved["xyz"]}".part*.rar "{resolved["xyz.par2"]}"'
 
         # input is absolute
-        assert instance.build_rm_command(Path("xyz.rar").resolve()) == \
-            f'rm -fv "{Path("xyz.rar").resolve()}" "{Path("xyz.par2").resolve()}"'
-        assert instance.build_rm_command(Path("xyz.part1.rar").resolve()) == \
-            f'rm -fv "{Path("xyz").resolve()}".part*.rar "{Path("xyz.par2").resolve()}"'
+        assert archiver_rar.build_rm_command(resolved["xyz.rar"]) == \
+            f'rm -fv "{resolved["xyz.rar"]}" "{resolved["xyz.par2"]}"'
+        assert archiver_rar.build_rm_command(resolved["xyz.part1.rar"]) == \
+            f'rm -fv "{resolved["xyz"]}".part*.rar "{resolved["xyz.par2"]}"'
 
         # no .rar
         with pytest.raises(AssertionError):
-            instance.build_rm_command(Path("xyz.rax"))
+            archiver_rar.build_rm_command(Path("xyz.rax"))
 
 
 class TestArchiver7z:
 
     @staticmethod
-    def test_find_archive_files():
-        actual = Archiver7z().find_archive_files(FILENAMES)
-        assert actual == {"volume7.7z.001", "volume8.7z"}
+    def test_find_archive_files(archiver_7z):
+        actual = archiver_7z.find_archive_files(FILENAMES)
+        assert actual == EXPECTED_7Z
 
     @staticmethod
-    def test_get_basename():
-        instance = Archiver7z()
-        assert instance.get_basename("xyz") == "xyz"
-        assert instance.get_basename("xyz.7z") == "xyz"
-        assert instance.get_basename("xyz.7z.000") == "xyz"
-        assert instance.get_basename("xyz.7z.001") == "xyz"
-        assert instance.get_basename("xyz.7z.0") == "xyz"
-        assert instance.get_basename("xyz.7z.8") == "xyz"
+    @pytest.mark.parametrize("filename,expected", [
+        ("xyz", "xyz"),
+        ("xyz.7z", "xyz"),
+        ("xyz.7z.000", "xyz"),
+        ("xyz.7z.001", "xyz"),
+        ("xyz.7z.0", "xyz"),
+        ("xyz.7z.8", "xyz"),
+    ])
+    def test_get_basename(filename, expected, archiver_7z):
+        assert archiver_7z.get_basename(filename) == expected
 
     @staticmethod
-    def test_build_rm_command():
-        instance = Archiver7z()
+    def test_build_rm_command(archiver_7z, resolved):
         # input is relative path
-        assert instance.build_rm_command(Path("xyz.7z")) == \
-            f'rm -fv "{Path("xyz").resolve()}".7z* "{Path("xyz.par2").resolve()}"'
-        assert instance.build_rm_command(Path("xyz.7z.001")) == \
-            f'rm -fv "{Path("xyz").resolve()}".7z* "{Path("xyz.par2").resolve()}"'
+        assert archiver_7z.build_rm_command(Path("xyz.7z")) == \
+            f'rm -fv "{resolved["xyz"]}".7z* "{resolved["xyz.par2"]}"'
+        assert archiver_7z.build_rm_command(Path("xyz.7z.001")) == \
+            f'rm -fv "{resolved["xyz"]}".7z* "{resolved["xyz.par2"]}"'
 
         # input is absolute path
-        assert instance.build_rm_command(Path("xyz.7z").resolve()) == \
-            f'rm -fv "{Path("xyz").resolve()}".7z* "{Path("xyz.par2").resolve()}"'
-        assert instance.build_rm_command(Path("xyz.7z.001").resolve()) == \
-            f'rm -fv "{Path("xyz").resolve()}".7z* "{Path("xyz.par2").resolve()}"'
+        assert archiver_7z.build_rm_command(resolved["xyz.7z"]) == \
+            f'rm -fv "{resolved["xyz"]}".7z* "{resolved["xyz.par2"]}"'
+        assert archiver_7z.build_rm_command(resolved["xyz.7z.001"]) == \
+            f'rm -fv "{resolved["xyz"]}".7z* "{resolved["xyz.par2"]}"'
 
         # no .rar
         with pytest.raises(AssertionError):
-            instance.build_rm_command(Path("xyz.7y"))
+            archiver_7z.build_rm_command(Path("xyz.7y"))
 
 
 def test_construct_quoted():
@@ -139,26 +170,26 @@ def test_main(monkeypatch, capsys):
     captured = capsys.readouterr()
     assert captured.err == ""
     lines = captured.out.splitlines()
-    assert len(lines) == 7
+    assert len(lines) == 6
     assert "sleep" not in captured.out  # too small for cooldown sleep
     assert "../" not in captured.out    # all paths must be absolute
-    # first 2 lines are metadata
+    # first line is metadata, the entry count is a trailer on the last line
     now = datetime.now().isoformat()
     assert lines[0].startswith(f"# created by NzbDownloadsMultiUnpack {__version__} ({__updated__}) at {now[:20]}")
-    assert lines[1] == "# 2 entries"
-    # third and following lines then contain the actual commands block
-    assert lines[2] == '# -- 1. --------------------------------------------------'
-    assert lines[3].startswith('unrar x -o- -p"foobardir" "/')
-    assert 'testdata/rar_example.dir.{{foobardir}}/rand.indir".part*.rar' in lines[3]
-    assert 'testdata/rar_example.dir.{{foobardir}}/rand.indir.par2"' in lines[3]
-    assert 'testdata/rar_example.dir.{{foobardir}}/" && rm ' in lines[3]
+    assert lines[-1] == "# 2 entries"
+    # second and following lines then contain the actual commands block
+    assert lines[1] == '# -- 1. --------------------------------------------------'
+    assert lines[2].startswith(EXPECTED_7Z_PREFIX)
+    assert EXPECTED_7Z_WILDCARD in lines[2]
+    assert EXPECTED_7Z_PAR2 in lines[2]
+    assert 'testdata/7z_example.dir.{{foobardir}}/rand.indir.7z.001" && rm' in lines[2]
     assert "sleep" not in lines[0]  # too small for cooldown sleep
     assert "../" not in lines[0]    # all paths must be absolute
-    assert lines[4] == '# -- 2. --------------------------------------------------'
-    assert lines[5].startswith('7z x -aos -o"/')
-    assert 'testdata/7z_example.dir.{{foobardir}}/rand.indir".7z*' in lines[5]
-    assert 'testdata/7z_example.dir.{{foobardir}}/rand.indir.par2"' in lines[5]
-    assert 'testdata/7z_example.dir.{{foobardir}}/rand.indir.7z.001" && rm' in lines[5]
+    assert lines[3] == '# -- 2. --------------------------------------------------'
+    assert lines[4].startswith(EXPECTED_UNRAR_PREFIX)
+    assert EXPECTED_RAR_WILDCARD in lines[4]
+    assert EXPECTED_RAR_PAR2 in lines[4]
+    assert 'testdata/rar_example.dir.{{foobardir}}/" && rm ' in lines[4]
 
 
 # https://docs.pytest.org/en/latest/how-to/capture-stdout-stderr.html#accessing-captured-output-from-a-test-function
@@ -175,24 +206,33 @@ def test_main_win32(monkeypatch, capsys):
     captured = capsys.readouterr()
     assert captured.err == ""
     lines = captured.out.splitlines()
-    assert len(lines) == 9
+    assert len(lines) == 6
     assert "sleep" not in captured.out  # too small for cooldown sleep
     assert "../" not in captured.out    # all paths must be absolute
-    # first 2 lines are metadata
+    assert "chcp" not in captured.out   # all commands are ASCII, no codepage switch
+    # first line is metadata, the entry count is a trailer on the last line
     now = datetime.now().isoformat()
     assert lines[0].startswith(f"REM created by NzbDownloadsMultiUnpack {__version__} ({__updated__}) at {now[:20]}")
-    assert lines[1] == "REM 2 entries"
-    assert lines[2] == "chcp 1252"
-    assert lines[3] == "REM --------------------------------------------------"
-    # third and following lines then contain the actual commands block
-    assert lines[4] == 'REM -- 1. --------------------------------------------------'
-    # third and following lines then contain the actual commands
-    assert lines[5].startswith('7z x -aos -o"/')
-    assert 'testdata/rar_example.dir.{{foobardir}}/rand.indir".part*.rar' in lines[5]
-    assert 'testdata/rar_example.dir.{{foobardir}}/rand.indir.par2"' in lines[5]
-    assert 'testdata/rar_example.dir.{{foobardir}}/rand.indir.part1.rar" && del /q "/' in lines[5]
-    assert lines[6] == 'REM -- 2. --------------------------------------------------'
-    assert lines[7].startswith('7z x -aos -o"/')
-    assert 'testdata/7z_example.dir.{{foobardir}}/rand.indir".7z*' in lines[7]
-    assert 'testdata/7z_example.dir.{{foobardir}}/rand.indir.par2"' in lines[7]
-    assert 'testdata/7z_example.dir.{{foobardir}}/rand.indir.7z.001" && del /q "/' in lines[7]
+    assert lines[-1] == "REM 2 entries"
+    # second and following lines then contain the actual commands block
+    assert lines[1] == 'REM -- 1. --------------------------------------------------'
+    assert lines[2].startswith(EXPECTED_7Z_PREFIX)
+    assert EXPECTED_7Z_WILDCARD in lines[2]
+    assert EXPECTED_7Z_PAR2 in lines[2]
+    assert 'testdata/7z_example.dir.{{foobardir}}/rand.indir.7z.001" && del /q "/' in lines[2]
+    assert lines[3] == 'REM -- 2. --------------------------------------------------'
+    assert lines[4].startswith(EXPECTED_7Z_PREFIX)
+    assert EXPECTED_RAR_WILDCARD in lines[4]
+    assert EXPECTED_RAR_PAR2 in lines[4]
+    assert 'testdata/rar_example.dir.{{foobardir}}/rand.indir.part1.rar" && del /q "/' in lines[4]
+
+
+def test_main_nonexistent_directory(monkeypatch, capsys):
+    """A missing root directory produces no output and exit code 2."""
+    # overwrite/monkeypatch sys.argv
+    monkeypatch.setattr("sys.argv", ("foo", "./does-not-exist/",))
+    # do action
+    assert main() == 2
+    # check
+    captured = capsys.readouterr()
+    assert captured.out == ""